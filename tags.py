@@ -25,6 +25,7 @@ from relations between reference anchors.
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import re
 import sqlite3
 from json import JSONEncoder
 from html import unescape
@@ -60,6 +61,8 @@ def escape_dict(chars, maketrans=False):
 
 class Anchor:
     # Anchor (graph node) class. Includes navigation methods.
+    __slots__ = ('content', 'db', 'q')
+
     def __init__(self, content, q=None, **kwargs):
         # kwargs accepted: db, init_sync
         db = kwargs.get('db')
@@ -173,6 +176,13 @@ class DB:
     """
     num_args = ('q', 'q_eq', 'q_gt', 'q_gte', 'q_lt', 'q_lte')
     default_out_format = 0x7
+    fmt_fns_a = {
+        # anchor output formatters for get_a(), by out_format;
+        # each is called as f(db, rout)
+        0x1: lambda db, rout: rout[0], # content only
+        0x3: lambda db, rout: (rout[0], rout[1]),
+        0x7: lambda db, rout: Anchor(rout[0], rout[1], db=db, init_sync=False),
+    }
 
     def __init__(self, repo, **kwargs):
         """Preparing a DB:
@@ -384,21 +394,10 @@ class DB:
           'date*' (with an asterisk, not wildcard)
 
         """
-        def format_bare(rout):
-            return (rout[0], rout[1])
-
-        def format_obj(rout):
-            return Anchor(rout[0], rout[1], db=self, init_sync=False)
-
-        def format_conly(rout):
-            # content only
-            return rout[0]
-
-        fmt_fns = {0x1: format_conly, 0x3: format_bare, 0x7: format_obj}
         fmt = kwargs.get('out_format', self.default_out_format)
         if fmt == 'interchange': fmt = 0x3
-        f = fmt_fns[fmt]
-        return (f(r) for r in self.repo.get_a(a, **kwargs))
+        f = self.fmt_fns_a[fmt]
+        return (f(self, r) for r in self.repo.get_a(a, **kwargs))
 
     def get_rel_names(self, s, **kwargs):
         """Get relation names
@@ -701,6 +700,22 @@ class DB:
         self._ck_args_str_not_empty(a=a)
         return self.repo.put_a(a, q)
 
+    def put_a_many(self, data):
+        """Put multiple Anchors into the database at once
+
+        Accepts an iterable of (a, q) tuples, with the same meanings
+        as the arguments of put_a(). Anchors are put all at once; if
+        any anchor cannot be put, none of them are.
+
+        Repositories should implement this method
+        """
+        def ck(data):
+            for a, q in data:
+                self._ck_args_str_not_empty(a=a)
+                yield (a, q)
+
+        return self.repo.put_a_many(ck(data))
+
     def put_rel(self, rel, a_from, a_to, q=None):
         """Create Relations
 
@@ -772,7 +787,6 @@ class SQLiteRepo:
     CHAR_ESCAPE = '\\'
     CHAR_WC_1C_SQL = "\u005f" # Underscore
     CHAR_WC_ZP_SQL = "\u0025" # Percent Sign
-    CHARS_WC = ""  # populated at runtime, see Setup below
     COL_CONFIG_KEY = "key"
     COL_CONFIG_VALUE = "v"
     COL_CONTENT = "content"
@@ -790,9 +804,11 @@ class SQLiteRepo:
         CHAR_WC_ZP_SQL: "{}{}".format(CHAR_ESCAPE, CHAR_WC_ZP_SQL)
     }
     # Setup
-    for c in TRANS_WC.keys():
-        CHARS_WC = "".join((CHARS_WC, c))
+    CHARS_WC = "".join(TRANS_WC.keys())
     TRANS_WC = str.maketrans(TRANS_WC)
+    RE_WC = re.compile("[{}]".format(re.escape(CHARS_WC)))
+    SC_INSERT_A = "INSERT INTO {} VALUES(?, ?)".format(TABLE_A)
+    SC_INSERT_CONFIG = "INSERT INTO {} VALUES(?, ?)".format(TABLE_CONFIG)
 
     def __init__(self, db_path=None, mode="rwc", **kwargs):
         """
@@ -863,16 +879,20 @@ class SQLiteRepo:
         # Setup: set config from SQLite file
         config_chars = self._slr_config_to_dict('CHAR_%')
         config_limits = self._slr_config_to_dict('MAX_%')
+        chars_f = []
+        chars_px = []
         for k in config_chars:
             if k.startswith('CHAR_F'):
                 c = config_chars[k]
                 self._trans_f[ord(c)] = escape(c)
-                self.special_chars['F'] = "".join((c, self.special_chars['F']))
+                chars_f.append(c)
             if k.startswith('CHAR_PX'):
                 c = config_chars[k]
-                self._chars_px = "".join((self._chars_px, c))
+                chars_px.append(c)
                 self._trans_px[ord(c)] = escape(c)
-                self.special_chars['PX'] = self._chars_px
+        self._chars_px = "".join(chars_px)
+        self.special_chars['F'] = "".join(reversed(chars_f))
+        self.special_chars['PX'] = self._chars_px
         self.preface_length = self._slr_config_to_dict('PRE%')['PREFACE_LENGTH']
         if 'preface_length' in kwargs:
             warn(
@@ -968,6 +988,26 @@ class SQLiteRepo:
                 return (False, a)
         return (True, None)
 
+    def _slr_ck_put_a(self, a):
+        """
+        Check if the anchor 'a' may be put. This method is intended
+        to be called by put_a() and put_a_many().
+
+        Raises ValueError if an anchor with the same preface as 'a'
+        exists.
+
+        """
+        ck = self._slr_ck_anchors_exist((a,))
+        if ck[0]:
+            apre = a[:self.preface_length]
+            raise ValueError('anchor starting with {} exists'.format(apre))
+
+    def _slr_ck_q(self, q):
+        """Raises TypeError if 'q' is neither None nor a number"""
+        if q is not None:
+            if type(q) not in (int, float):
+                raise TypeError('q must be a number')
+
     def _slr_ck_tables(self):
         """
         Check if the anchor table has been created in an SQLite
@@ -1044,10 +1084,9 @@ class SQLiteRepo:
 
     def _slr_dict_to_config(self, confdict):
         """Writes a dict to the database config table"""
-        sc = "INSERT INTO {} VALUES(?,?)".format(self.TABLE_CONFIG)
         cs = self._slr_get_shared_cursor()
         for k in confdict:
-            cs.execute(sc, (k, confdict[k]))
+            cs.execute(self.SC_INSERT_CONFIG, (k, confdict[k]))
         self._db_conn.commit()
 
     def _slr_insert_into_a(self, item, q):
@@ -1059,12 +1098,9 @@ class SQLiteRepo:
         duplicate anchors or relations.
 
         """
-        if q is not None:
-            if type(q) not in (int, float):
-                raise TypeError('q must be a number')
-        sc = 'INSERT INTO {} VALUES(?, ?)'.format(self.TABLE_A)
+        self._slr_ck_q(q)
         cs = self._slr_get_shared_cursor()
-        cs.execute(sc, (item, q))
+        cs.execute(self.SC_INSERT_A, (item, q))
         self._db_conn.commit()
         return {'_sql_rowid': self._slr_get_last_insert_rowid()}
 
@@ -1207,7 +1243,7 @@ class SQLiteRepo:
             raise(NotImplementedError('alphanumeric aliases not supported'))
 
     def _has_wildcards(self, a):
-        return True in map(lambda x: x in a, self.CHARS_WC)
+        return self.RE_WC.search(a) is not None
 
     def _reltext(self, name='*', a_from='*', a_to='*', **kwargs):
         """
@@ -1275,12 +1311,23 @@ class SQLiteRepo:
         backing store
 
         """
-        ck = self._slr_ck_anchors_exist((a,))
-        if ck[0]:
-            apre = a[:self.preface_length]
-            raise ValueError('anchor starting with {} exists'.format(apre))
+        self._slr_ck_put_a(a)
         return self._slr_insert_into_a(self._prep_a(a, wildcards=False), q)
 
+    def put_a_many(self, data):
+        """Handle DB request to put multiple anchors in a single
+        transaction. Accepts the same arguments as DB.put_a_many().
+
+        """
+        def rows():
+            for a, q in data:
+                self._slr_ck_q(q)
+                self._slr_ck_put_a(a)
+                yield (self._prep_a(a, wildcards=False), q)
+
+        with self._db_conn:
+            self._db_conn.executemany(self.SC_INSERT_A, rows())
+
     def set_a_q(self, a, q, **kwargs):
         """Handle DB request to assign a numerical quantity to an
         anchor. Called from DB.set_a_q()
@@ -1536,7 +1583,8 @@ class SQLiteRepo:
         params = kwargs.copy()
         params['term'] = term
         cs = kwargs.get('cursor', self._db_conn.cursor())
+        char_rel = self._char_rel
         return (
-            r[0].split(self._char_rel)+[r[1],] for r in cs.execute(sc, params)
+            (*c.split(char_rel), q) for c, q in cs.execute(sc, params)
         )
 
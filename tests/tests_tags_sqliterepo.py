@@ -16,18 +16,126 @@ Bakdoh TAGS Test Modules: SQLiteRepository
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import sqlite3
 from tags import escape, CHAR_WC_1C, CHAR_WC_ZP, SQLiteRepo
-from tests.db import DB, DBGetTests, DBWriteTests
+from tests.db import DB, DBGetTests, DBTests, DBWriteTests
 from unittest import TestCase
 
-valid_types_a = ([str, int], [str, float], [str, type(None)])
-valid_types_rel = (
-    [str, str, str, int],
-    [str, str, str, float],
-    [str, str, str, type(None)],
-)
+# SQL statements for direct access to the anchor table
+SC_DELETE_A = "DELETE FROM {}".format(SQLiteRepo.TABLE_A)
+SC_DUMP_A = "SELECT * FROM {}".format(SQLiteRepo.TABLE_A)
+
+valid_types_a = frozenset((
+    (str, int),
+    (str, float),
+    (str, type(None)),
+))
+valid_types_rel = frozenset((
+    (str, str, str, int),
+    (str, str, str, float),
+    (str, str, str, type(None)),
+))
+
+class SlrDbTestsMixin:
+    """
+    SQLiteRepo-specific implementations of the DBTests helper
+    methods. Please see DBTests in the tests.db module for details
+
+    """
+    @staticmethod
+    def direct_insert(db, x):
+        """Insert anchors and relations straight into the anchor
+        table, in a single transaction.
+
+        Raises TypeError if any item in 'x' is not a valid anchor
+        or relation; nothing is inserted if this happens.
+
+        """
+        repo = db.repo
+        rt = repo._reltext
+
+        def rows():
+            for r in x:
+                ts = tuple(map(type, r))
+                if ts in valid_types_rel:
+                    yield (rt(r[0], r[1], r[2], wildcards=False), r[3])
+                elif ts in valid_types_a:
+                    yield (repo._prep_a(r[0], wildcards=False), r[1])
+                else:
+                    raise TypeError('not an anchor or relation: {}'.format(r))
+
+        with repo._db_conn:
+            repo._db_conn.executemany(SQLiteRepo.SC_INSERT_A, rows())
+
+    def snapshot(self, db):
+        """Copy the database into a new in-memory SQLite database
+        with the SQLite Online Backup API
+
+        """
+        snap = sqlite3.connect(":memory:")
+        db.repo._db_conn.backup(snap)
+        return snap
+
+    _repo_pool = []
+
+    def restore(self, snap):
+        """Copy a snapshot into a repository from the pool, or into a
+        new repository if none in the pool can be used.
+
+        The backup replaces the entire database, so repositories
+        need not be cleared before re-use.
 
-class SlrDbExportTests(TestCase):
+        """
+        while self._repo_pool:
+            testrepo = self._repo_pool.pop()
+            try:
+                snap.backup(testrepo._db_conn)
+                return DB(testrepo)
+            except sqlite3.OperationalError:
+                # repository still in use, e.g. by an unfinished query
+                testrepo._db_conn.close()
+        testrepo = SQLiteRepo()
+        snap.backup(testrepo._db_conn)
+        return DB(testrepo)
+
+    def discard(self, db):
+        conn = db.repo._db_conn
+        if conn.in_transaction:
+            conn.rollback()
+        self._repo_pool.append(db.repo)
+
+def tearDownModule():
+    # close the connections of cached snapshots and pooled repositories
+    snaps = DBTests._snapshots
+    for k in [k for k in snaps if k[0] is SQLiteRepo]:
+        snaps.pop(k).close()
+    while SlrDbTestsMixin._repo_pool:
+        SlrDbTestsMixin._repo_pool.pop()._db_conn.close()
+
+class SlrSharedRepoTests(TestCase):
+    """
+    Base class for SQLiteRepo tests that share one repository per
+    test class. The anchor table is emptied after every test, so
+    each test still starts with an empty database.
+
+    """
+    @classmethod
+    def setUpClass(cls):
+        cls.testrepo = SQLiteRepo()
+        cls.testdb = DB(cls.testrepo)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.testrepo._db_conn.close()
+
+    def tearDown(self):
+        conn = self.testrepo._db_conn
+        if conn.in_transaction:
+            conn.rollback()
+        with conn:
+            conn.execute(SC_DELETE_A)
+
+class SlrDbExportTests(SlrDbTestsMixin, TestCase):
     """
     Verify the operation of SQLiteRepo's export function.
 
@@ -39,35 +147,20 @@ class SlrDbExportTests(TestCase):
     are repository class-specific.
 
     """
-    def setUp(self):
-        # Most direct SQLiteRepo insert humanly possible
-        self.testdb = DB(SQLiteRepo())
-        sc_insert = "INSERT INTO {} VALUES(?,?)".format(SQLiteRepo.TABLE_A)
-        rt = self.testdb.repo._reltext
-        cs = self.testdb.repo._db_conn.cursor()
-        inp = (
-            ('a', None),
-            ('j', None),
-            ('t', 0.0001),
-            ('z', -274),
-            (rt('j', 'a', 'j'), None),
-            (rt('t', 'a', 't'), -274),
-            (rt('a', 'z', 'a'), 37)
-        )
-        cs.executemany(sc_insert, inp)
+    @classmethod
+    def setUpClass(cls):
+        # export() does not write to the database, so the fixture
+        # is loaded once and shared by all tests in this class
+        cls.testdb = DB(SQLiteRepo())
+        cls.direct_insert(cls.testdb, INIT_EXPORT)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.testdb.repo._db_conn.close()
 
     def test_export_all_interchange(self):
-        out = list(self.testdb.export())
-        expected = [
-            ('a', None),
-            ('j', None),
-            ('t', 0.0001),
-            ('z', -274),
-            ('j', 'a', 'j', None),
-            ('t', 'a', 't', -274),
-            ('a', 'z', 'a', 37)
-        ]
-        self.assertEqual(out, expected)
+        out = tuple(self.testdb.export())
+        self.assertEqual(out, INIT_EXPORT)
 
     def test_export_anchor_interchange(self):
         """Export just one anchor and its relations to the
@@ -83,7 +176,7 @@ class SlrDbExportTests(TestCase):
         ]
         self.assertEqual(out, expected)
 
-class SlrDbImportTests(TestCase):
+class SlrDbImportTests(SlrSharedRepoTests):
     """
     Verify the operation of SQLiteRepo's import function.
 
@@ -96,8 +189,7 @@ class SlrDbImportTests(TestCase):
 
     """
     def test_import(self):
-        testdb = DB(SQLiteRepo())
-        sc_dump = "SELECT * FROM {}".format(SQLiteRepo.TABLE_A)
+        testdb = self.testdb
         cs = testdb.repo._db_conn.cursor()
         inp = (
             ('a',),
@@ -117,24 +209,23 @@ class SlrDbImportTests(TestCase):
             (rt('t', 'a', 't'), -274)
         )
         testdb.import_data(inp)
-        sample = tuple(cs.execute(sc_dump))
+        sample = tuple(cs.execute(SC_DUMP_A))
         self.assertEqual(sample, expected)
 
     def test_import_unsupported_format(self):
         """import_data(): reject unsupported formats"""
 
-        testdb = DB(SQLiteRepo())
-        sc_dump = "SELECT * FROM {}".format(SQLiteRepo.TABLE_A)
+        testdb = self.testdb
         cs = testdb.repo._db_conn.cursor()
         inp = (
             ('a', 0.1, 0.5, 0.75, 1.1),
             {},
         )
         out = testdb.import_data(inp)
-        final = tuple(cs.execute(sc_dump))
+        final = tuple(cs.execute(SC_DUMP_A))
         self.assertEqual(final, ())
 
-class SlrDbGetTests(DBGetTests):
+class SlrDbGetTests(SlrDbTestsMixin, DBGetTests):
     """
     Run the Database Get Tests with a SQLiteRepository.
     Please see DBGetTests in the tests.db module for details
@@ -142,7 +233,7 @@ class SlrDbGetTests(DBGetTests):
     """
     RepoClass = SQLiteRepo
 
-class SlrDbWriteTests(DBWriteTests):
+class SlrDbWriteTests(SlrDbTestsMixin, DBWriteTests):
     """
     Run Database Delete, Put and Set q-value Tests with a
     SQLiteRepository.
@@ -152,97 +243,59 @@ class SlrDbWriteTests(DBWriteTests):
     """
     RepoClass = SQLiteRepo
 
-class SLR_ReltextTests(TestCase):
+class SLR_ReltextTests(SlrSharedRepoTests):
     """Tests for _reltext()"""
 
     def test_reltext(self):
-        testrep = SQLiteRepo()
-        testdb = DB(testrep)
+        testrep = self.testrepo
+        testdb = self.testdb
         data = [('a', None), ('z', None)]
         testdb.import_data(data)
         char_rel = testrep._char_rel
-        char_alias = testrep._char_alias
-        argtests = (
-            (
-                {
-                    'name': 'Raz',
-                    'a_from': 'a',
-                    'a_to': 'z',
-                    'alias': 'local',
-                    'alias_fmt': 0
-                },
-                'Raz{0}a{0}z'.format(char_rel)
-            ),
-        ) # format: (kwargs, expected_output)
-        for a in argtests:
+        for a in TEST_DATA_RELTEXT:
             with self.subTest(a=a):
-                self.assertEqual(testrep._reltext(**a[0]), a[1])
+                expected = a[1].format(char_rel)
+                self.assertEqual(testrep._reltext(**a[0]), expected)
 
 class SLR_QClauseTests(TestCase):
     """Tests for _slr_q_clause()"""
 
+    @classmethod
+    def setUpClass(cls):
+        cls.testrep = SQLiteRepo()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.testrep._db_conn.close()
+
     def test(self):
         """Generate SQL expression for q range in WHERE clause"""
-        testrep = SQLiteRepo()
-        argtests = (
-            ({}, (' ')),
-            ({'q_eq':5}, ' AND {} = :q_eq'),
-            ({'q_eq':0}, ' AND {} = :q_eq'),
-            ({'q_gt':1}, ' AND {} > :q_gt'),
-            ({'q_gt':0}, ' AND {} > :q_gt'),
-            ({'q_lt':9}, ' AND {} < :q_lt'),
-            ({'q_lt':0}, ' AND {} < :q_lt'),
-            ({'q_gt':1, 'q_lt':9}, ' AND {0} > :q_gt AND {0} < :q_lt'),
-            ({'q_gt':0, 'q_lt':0}, ' AND {0} > :q_gt OR {0} < :q_lt'),
-            (
-                {'q_gt':1, 'q_lt':9, 'q_lte': 9},
-                ' AND {0} > :q_gt AND {0} < :q_lt'
-            ),
-            ({'q_gte':1, 'q_lte':9}, ' AND {0} >= :q_gte AND {0} <= :q_lte'),
-            ({'q_gt':9, 'q_lt':1}, ' AND {0} > :q_gt OR {0} < :q_lt'),
-            (
-                {'q_gt':9, 'q_gte':7, 'q_lt':1},
-                ' AND {0} > :q_gt OR {0} < :q_lt'
-            ),
-            ({'q_gte':9, 'q_lte':1}, ' AND {0} >= :q_gte OR {0} <= :q_lte'),
-            (
-                {'q_gt':9, 'q_gte':7, 'q_lt':3, 'q_lte':1},
-                ' AND {0} > :q_gt OR {0} < :q_lt'
-            ),
-            (
-                {'q_gt':1, 'q_gte':3, 'q_lt':7, 'q_lte':9},
-                ' AND {0} > :q_gt AND {0} < :q_lt'
-            ),
-           (
-                {'q_eq':5, 'q_gt':9, 'q_gte':9, 'q_lt':1, 'q_lte':9},
-                ' AND {} = :q_eq'
-            ),
-        ) # format: (kwargs, expected_output)
-          # PROTIP: {0} will be replaced with q-value column name
-        for x, y in argtests:
+        col_q = self.testrep.COL_Q
+        q_clause = self.testrep._slr_q_clause
+        for x, y in TEST_DATA_Q_CLAUSE:
             with self.subTest(args=x):
-                expected = y.format(testrep.COL_Q)
-                self.assertEqual(testrep._slr_q_clause(**x), expected)
+                self.assertEqual(q_clause(**x), y.format(col_q))
 
     def test_not(self):
         """Generate SQL expression for q range in WHERE clause (q_not)"""
-        testrep = SQLiteRepo()
-        argtests = (
-            ({'q_eq':5, 'q_not': True}, ' AND NOT ({} = :q_eq) '),
-            ({'q_eq':0, 'q_not': True}, ' AND NOT ({} = :q_eq) '),
-        )
-        for x, y in argtests:
+        col_q = self.testrep.COL_Q
+        q_clause = self.testrep._slr_q_clause
+        for x, y in TEST_DATA_Q_CLAUSE_NOT:
             with self.subTest(args=x):
-                expected = y.format(testrep.COL_Q)
-                self.assertEqual(testrep._slr_q_clause(**x), expected)
+                self.assertEqual(q_clause(**x), y.format(col_q))
 
 class SlrPrepTermTests(TestCase):
     """Tests for _prep_term()"""
 
-    def setUp(self):
-        self.testrepo = SQLiteRepo()
-        self.escape = self.testrepo.CHAR_ESCAPE
-        self.alias = self.testrepo._char_alias
+    @classmethod
+    def setUpClass(cls):
+        cls.testrepo = SQLiteRepo()
+        cls.escape = cls.testrepo.CHAR_ESCAPE
+        cls.alias = cls.testrepo._char_alias
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.testrepo._db_conn.close()
 
     def test_prep_term_alias(self):
         """Handle ROWID aliases"""
@@ -275,9 +328,14 @@ class SlrPrepTermTests(TestCase):
 class SlrPrepATests(TestCase):
     """Tests for _prep_a()"""
 
-    def setUp(self):
-        self.testrepo = SQLiteRepo()
-        self.chardict = self.testrepo.special_chars
+    @classmethod
+    def setUpClass(cls):
+        cls.testrepo = SQLiteRepo()
+        cls.chardict = cls.testrepo.special_chars
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.testrepo._db_conn.close()
 
     def test_prep_a_special_chars_forbidden(self):
         """Handle forbidden characters in relation names or anchor content.
@@ -314,11 +372,11 @@ class SlrPrepATests(TestCase):
                     self.testrepo._prep_a(term, wildcards=False), expected
                 )
 
-class SLRGetATests(TestCase):
+class SLRGetATests(SlrSharedRepoTests):
     """Tests for get_a()"""
 
     def test_get_a_alias(self):
-        testdb = DB(SQLiteRepo())
+        testdb = self.testdb
         data = (
             ('a', 10),
             ('b', 11),
@@ -334,8 +392,8 @@ class SLRGetATests(TestCase):
         The preface of the content must be able to retrieve the Anchor
 
         """
-        testrepo = SQLiteRepo()
-        testdb = DB(testrepo)
+        testrepo = self.testrepo
+        testdb = self.testdb
         contents = [
             "{}{}".format(x, "N" * testrepo.preface_length) for x in range(3)
         ]
@@ -355,8 +413,8 @@ class SLRGetATests(TestCase):
 
     def test_get_a_wildcard_long_rel_in_db(self):
         """Get single anchor by wildcard, when long relation is in db"""
-        testrepo = SQLiteRepo()
-        testdb = DB(testrepo)
+        testrepo = self.testrepo
+        testdb = self.testdb
         plen = testrepo.preface_length
         suffix = "N" * plen
         long_content_a = "{}{}".format("A", suffix)
@@ -374,7 +432,7 @@ class SLRGetATests(TestCase):
 
     def test_get_a_exact_sql_wildcard_escape(self):
         """Get single anchor containing SQL wildcard characters"""
-        testdb = DB(SQLiteRepo())
+        testdb = self.testdb
         chars = (SQLiteRepo.CHAR_WC_ZP_SQL, SQLiteRepo.CHAR_WC_1C_SQL)
         data = [(x, 100) for x in chars]
         testdb.import_data(data)
@@ -387,7 +445,7 @@ class SLRGetATests(TestCase):
 
     def test_get_a_sql_wildcard_escape(self):
         """Get anchors containing SQL wildcard characters using wildcards"""
-        testdb = DB(SQLiteRepo())
+        testdb = self.testdb
         t = lambda x: "{0}E{0}".format(x)
         chars = (SQLiteRepo.CHAR_WC_ZP_SQL, SQLiteRepo.CHAR_WC_1C_SQL)
         data = [(t(x), 100) for x in chars]
@@ -406,15 +464,17 @@ class SLRGetATests(TestCase):
         TAGS wildcards are allowed to be stored in DB
 
         """
-        testdb = DB(SQLiteRepo())
+        testdb = self.testdb
         chars = (CHAR_WC_ZP, CHAR_WC_1C)
+        data = {
+            c: [("{}{}".format(c, n), None) for n in range(3)] for c in chars
+        }
+        testdb.import_data([d for c in chars for d in data[c]])
         for c in chars:
-            data = [("{}{}".format(c, n), None) for n in range(3)]
-            testdb.import_data(data)
             with self.subTest(char=c):
                 term = "{}*".format(escape(c))
                 samp = list(testdb.get_a(term, out_format='interchange'))
-                self.assertEqual(samp, data)
+                self.assertEqual(samp, data[c])
 
     def test_get_a_special_chars_prefix(self):
         """Get anchors containing escaped prefix special chars
@@ -422,7 +482,7 @@ class SLRGetATests(TestCase):
         Only the first char needs to be escaped
 
         """
-        testdb = DB(SQLiteRepo())
+        testdb = self.testdb
         px_chars = testdb.get_special_chars()["PX"]
         fi = lambda x: "{}uuu{}u".format(escape(x), x) # format input
         fo = lambda x: "{0}uuu{0}u".format(x)          # format output
@@ -435,7 +495,7 @@ class SLRGetATests(TestCase):
 
     def test_get_a_special_chars_mixed(self):
         """Put anchor containing all special and wildcard characters"""
-        testdb = DB(SQLiteRepo())
+        testdb = self.testdb
         chardict = testdb.get_special_chars()
         suffix = "".join((chardict["E"], chardict["F"], chardict["WC"]))
         data = [("".join((x, suffix)), -10) for x in chardict["PX"]]
@@ -444,13 +504,13 @@ class SLRGetATests(TestCase):
             samp = list(testdb.export())
             self.assertEqual(samp, data)
 
-class SLRPutATests(TestCase):
+class SLRPutATests(SlrSharedRepoTests):
     """Tests for put_a()"""
 
     def test_put_a_long_content(self):
         """Put anchors with long-form content"""
-        testrepo = SQLiteRepo()
-        testdb = DB(testrepo)
+        testrepo = self.testrepo
+        testdb = self.testdb
         contents = [
             "{}{}".format(x, "N" * testrepo.preface_length) for x in range(3)
         ]
@@ -467,8 +527,8 @@ class SLRPutATests(TestCase):
         and cannot be reused.
 
         """
-        testrepo = SQLiteRepo()
-        testdb = DB(testrepo)
+        testrepo = self.testrepo
+        testdb = self.testdb
         contents = [
             "{}{}".format("N" * testrepo.preface_length, x) for x in range(3)
         ]
@@ -487,8 +547,8 @@ class SLRPutATests(TestCase):
         anchors must remain intact.
 
         """
-        testrepo = SQLiteRepo()
-        testdb = DB(testrepo)
+        testrepo = self.testrepo
+        testdb = self.testdb
         preface = "N" * testrepo.preface_length
         init = [("{}".format(preface), None),] # anchor equiv. to preface
         data = ("".join((preface, "X")), None) # regular long-form anchor
@@ -500,7 +560,7 @@ class SLRPutATests(TestCase):
 
     def test_put_a_special_chars(self):
         """Put anchor containing special reserved characters"""
-        testdb = DB(SQLiteRepo())
+        testdb = self.testdb
         data = [(escape(x), None) for x in testdb.repo.special_chars["F"]]
         expected = [(x, None) for x in testdb.repo.special_chars["F"]]
         for d in data:
@@ -516,7 +576,7 @@ class SLRPutATests(TestCase):
         anchors, except for the first character.
 
         """
-        testdb = DB(SQLiteRepo())
+        testdb = self.testdb
         fi = lambda x: "{0}uuu{0}u".format(escape(x)) # format input
         fo = lambda x: "{0}uuu{0}u".format(x)         # format output
         data = [(fi(x), None) for x in testdb.repo.special_chars["PX"]]
@@ -528,7 +588,7 @@ class SLRPutATests(TestCase):
 
     def test_put_a_special_chars_wildcards(self):
         """Put anchor containing wildcard characters"""
-        testdb = DB(SQLiteRepo())
+        testdb = self.testdb
         chars = (
             CHAR_WC_ZP,
             CHAR_WC_1C,
@@ -547,7 +607,7 @@ class SLRPutATests(TestCase):
         Characters must come out the same way they went in.
 
         """
-        testdb = DB(SQLiteRepo())
+        testdb = self.testdb
         fi = lambda x, y: "".join((escape(x), y))
         chardict = testdb.get_special_chars()
         suffix = "".join((chardict["E"], chardict["F"], chardict["WC"]))
@@ -557,12 +617,43 @@ class SLRPutATests(TestCase):
         samp = list(testdb.export())
         self.assertEqual(samp, data)
 
-class SLRPutRelsTests(TestCase):
+    def test_put_a_many(self):
+        """Put multiple anchors, including wildcard characters, at once"""
+        testdb = self.testdb
+        chars = (
+            CHAR_WC_ZP,
+            CHAR_WC_1C,
+            SQLiteRepo.CHAR_WC_ZP_SQL,
+            SQLiteRepo.CHAR_WC_1C_SQL
+        )
+        data = [(x, -10) for x in chars] + [('a', None), ('z', 0.5)]
+        testdb.put_a_many(data)
+        samp = list(testdb.export())
+        self.assertEqual(samp, data)
+
+    def test_put_a_many_conflicting_preface(self):
+        """Put multiple anchors at once in presence of conflicting anchor
+
+        If any one of the anchors cannot be put, none of them must be
+        put. Existing anchors must remain intact.
+
+        """
+        testdb = self.testdb
+        preface = "N" * self.testrepo.preface_length
+        init = [(preface, None),]
+        data = [('a', None), ("".join((preface, "X")), None)]
+        testdb.import_data(init)
+        with self.assertRaises(ValueError):
+            testdb.put_a_many(data)
+        samp = list(testdb.export())
+        self.assertEqual(samp, init)
+
+class SLRPutRelsTests(SlrSharedRepoTests):
     """Tests for put_rels()"""
 
     def test_put_rel_special_chars_wc(self):
         """Put relations containing wildcard characters"""
-        testdb = DB(SQLiteRepo())
+        testdb = self.testdb
         init = (
             ('a***', 10),
             ('b???', 20),
@@ -577,13 +668,13 @@ class SLRPutRelsTests(TestCase):
         samp = list(testdb.export())
         self.assertEqual(samp, final)
 
-class SLRGetRelsTests(TestCase):
+class SLRGetRelsTests(SlrSharedRepoTests):
     """Tests for get_rels()"""
 
     def test_get_rel_long_content(self):
         """Get relations between anchors with long content"""
-        testrepo = SQLiteRepo()
-        testdb = DB(testrepo)
+        testrepo = self.testrepo
+        testdb = self.testdb
         plen = testrepo.preface_length
         suffix = "N" * plen
         long_content_a = "{}{}".format("A", suffix)
@@ -600,27 +691,12 @@ class SLRGetRelsTests(TestCase):
         self.assertEqual(samp, expected)
 
     def test_get_rel_long_name(self):
-        """Get relations with long names (exceeding preface length)"""
-        testrepo = SQLiteRepo()
-        testdb = DB(testrepo)
-        plen = testrepo.preface_length
-        suffix = "N" * plen
-        long_name = f"R{suffix}"
-        init = (
-            ('a', 0),
-            ('b', 1),
-            ("R", 1),
-            (long_name, 'a', 'b', 100)
-        )
-        expected = [(long_name, 'a', 'b', 100),]
-        testdb.import_data(init)
-        samp = list(testdb.get_rels(name=long_name, out_format='interchange'))
-        self.assertEqual(samp, expected)
+        """Get relations with long names (exceeding preface length),
+        by exact name and by name wildcard
 
-    def test_get_rel_long_name_wildcard(self):
-        """Get relations with long names by name wildcard"""
-        testrepo = SQLiteRepo()
-        testdb = DB(testrepo)
+        """
+        testrepo = self.testrepo
+        testdb = self.testdb
         plen = testrepo.preface_length
         suffix = "N" * plen
         long_name = f"R{suffix}"
@@ -632,12 +708,14 @@ class SLRGetRelsTests(TestCase):
         )
         expected = [(long_name, 'a', 'b', 100),]
         testdb.import_data(init)
-        samp = list(testdb.get_rels(name="R*", out_format='interchange'))
-        self.assertEqual(samp, expected)
+        for name in (long_name, "R*"):
+            with self.subTest(name=name):
+                samp = testdb.get_rels(name=name, out_format='interchange')
+                self.assertEqual(list(samp), expected)
 
     def test_get_rel_special_chars_wc(self):
         """Get relations containing wildcard characters"""
-        testdb = DB(SQLiteRepo())
+        testdb = self.testdb
         init = (
             ('a***', 10),
             ('b???', 20),
@@ -648,7 +726,22 @@ class SLRGetRelsTests(TestCase):
         samp = next(testdb.get_rels(a_from='a&#42;*', out_format='interchange'))
         self.assertEqual(samp, expected)
 
-class SLRSetQTests(TestCase):
+    def test_get_rel_q_changed_during_iteration(self):
+        """Get anchor q-values changed while results are consumed"""
+        testdb = self.testdb
+        init = (
+            ('a', 1),
+            ('b', 2),
+            ('r', 'a', 'b', None),
+            ('s', 'a', 'b', None),
+        )
+        testdb.import_data(init)
+        it = testdb.get_rels(a_from='a', out_format=0x3)
+        self.assertEqual(next(it)[2], ('b', 2))
+        testdb.set_a_q('b', 50)
+        self.assertEqual(next(it)[2], ('b', 50))
+
+class SLRSetQTests(SlrSharedRepoTests):
     """Tests for setting q-values"""
 
     def test_set_a_q_long_content(self):
@@ -657,8 +750,8 @@ class SLRSetQTests(TestCase):
         The preface of the content must be able to set the Anchor's q-value
 
         """
-        testrepo = SQLiteRepo()
-        testdb = DB(testrepo)
+        testrepo = self.testrepo
+        testdb = self.testdb
         suffix = "N" * testrepo.preface_length
         init = [
             ("{}{}".format("Z", suffix), 0),
@@ -674,7 +767,7 @@ class SLRSetQTests(TestCase):
         self.assertEqual(samp, expected)
 
     def test_set_a_q_special_chars_wc(self):
-        testdb = DB(SQLiteRepo())
+        testdb = self.testdb
         init = (
             ('a***', 10),
             ('b???', 20),
@@ -689,7 +782,7 @@ class SLRSetQTests(TestCase):
         self.assertEqual(samp, expected)
 
     def test_set_rel_q_special_chars_wc(self):
-        testdb = DB(SQLiteRepo())
+        testdb = self.testdb
         init = (
             ('a***', 10),
             ('b???', 20),
@@ -706,11 +799,11 @@ class SLRSetQTests(TestCase):
         self.assertEqual(samp, expected)
 
 
-class SLRIncrQTests(TestCase):
+class SLRIncrQTests(SlrSharedRepoTests):
     """Tests for setting q-values"""
 
     def test_incr_a_q_special_chars_wc(self):
-        testdb = DB(SQLiteRepo())
+        testdb = self.testdb
         init = (
             ('a***', 10),
             ('b???', 20),
@@ -725,7 +818,7 @@ class SLRIncrQTests(TestCase):
         self.assertEqual(samp, expected)
 
     def test_incr_rel_q_special_chars_wc(self):
-        testdb = DB(SQLiteRepo())
+        testdb = self.testdb
         init = (
             ('a***', 10),
             ('b???', 20),
@@ -741,3 +834,76 @@ class SLRIncrQTests(TestCase):
         samp = list(testdb.export())
         self.assertEqual(samp, expected)
 
+#
+# Test Data
+# =========
+# Fixtures and argument tables shared by the tests above. These are
+# built once, on import.
+#
+
+# Initial state for SlrDbExportTests; a full export must match it
+INIT_EXPORT = (
+    ('a', None),
+    ('j', None),
+    ('t', 0.0001),
+    ('z', -274),
+    ('j', 'a', 'j', None),
+    ('t', 'a', 't', -274),
+    ('a', 'z', 'a', 37)
+)
+
+# Format for the following: (kwargs, expected_output)
+# PROTIP: {0} will be replaced with the relation marker character
+TEST_DATA_RELTEXT = (
+    (
+        {
+            'name': 'Raz',
+            'a_from': 'a',
+            'a_to': 'z',
+            'alias': 'local',
+            'alias_fmt': 0
+        },
+        'Raz{0}a{0}z'
+    ),
+)
+
+# PROTIP: {0} will be replaced with the q-value column name
+TEST_DATA_Q_CLAUSE = (
+    ({}, (' ')),
+    ({'q_eq':5}, ' AND {} = :q_eq'),
+    ({'q_eq':0}, ' AND {} = :q_eq'),
+    ({'q_gt':1}, ' AND {} > :q_gt'),
+    ({'q_gt':0}, ' AND {} > :q_gt'),
+    ({'q_lt':9}, ' AND {} < :q_lt'),
+    ({'q_lt':0}, ' AND {} < :q_lt'),
+    ({'q_gt':1, 'q_lt':9}, ' AND {0} > :q_gt AND {0} < :q_lt'),
+    ({'q_gt':0, 'q_lt':0}, ' AND {0} > :q_gt OR {0} < :q_lt'),
+    (
+        {'q_gt':1, 'q_lt':9, 'q_lte': 9},
+        ' AND {0} > :q_gt AND {0} < :q_lt'
+    ),
+    ({'q_gte':1, 'q_lte':9}, ' AND {0} >= :q_gte AND {0} <= :q_lte'),
+    ({'q_gt':9, 'q_lt':1}, ' AND {0} > :q_gt OR {0} < :q_lt'),
+    (
+        {'q_gt':9, 'q_gte':7, 'q_lt':1},
+        ' AND {0} > :q_gt OR {0} < :q_lt'
+    ),
+    ({'q_gte':9, 'q_lte':1}, ' AND {0} >= :q_gte OR {0} <= :q_lte'),
+    (
+        {'q_gt':9, 'q_gte':7, 'q_lt':3, 'q_lte':1},
+        ' AND {0} > :q_gt OR {0} < :q_lt'
+    ),
+    (
+        {'q_gt':1, 'q_gte':3, 'q_lt':7, 'q_lte':9},
+        ' AND {0} > :q_gt AND {0} < :q_lt'
+    ),
+    (
+        {'q_eq':5, 'q_gt':9, 'q_gte':9, 'q_lt':1, 'q_lte':9},
+        ' AND {} = :q_eq'
+    ),
+)
+
+TEST_DATA_Q_CLAUSE_NOT = (
+    ({'q_eq':5, 'q_not': True}, ' AND NOT ({} = :q_eq) '),
+    ({'q_eq':0, 'q_not': True}, ' AND NOT ({} = :q_eq) '),
+)